@@ -6,6 +6,7 @@ Supports variable read/write, job submission, batch jobs, and polling.
 """
 
 import copy
+import json
 import threading
 import time
 import uuid
@@ -14,7 +15,7 @@ from typing import Any, Optional
 
 import numpy as np
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, ConfigDict
 
@@ -42,8 +43,8 @@ class VariableStruct(BaseModel):
     metadata: Optional[dict] = None
 
 
-class SubmitRequest(BaseModel):
-    """POST /submit body."""
+class JobInput(BaseModel):
+    """Single job inside a batch ``POST /jobs`` request."""
 
     model_config = ConfigDict(extra='forbid')
 
@@ -51,22 +52,21 @@ class SubmitRequest(BaseModel):
     variables: dict[str, VariableStruct]
 
 
-class GetRequest(BaseModel):
-    """POST /get body."""
-
-    model_config = ConfigDict(extra='forbid')
+class SubmitRequest(JobInput):
+    """POST /submit body.
 
-    job_id: Optional[str] = None
-    variables: list[str]
+    Same shape as a single :class:`JobInput`, so the validated request is
+    enqueued directly without being rebuilt.
+    """
 
 
-class JobInput(BaseModel):
-    """Single job inside a batch ``POST /jobs`` request."""
+class GetRequest(BaseModel):
+    """POST /get body."""
 
     model_config = ConfigDict(extra='forbid')
 
     job_id: Optional[str] = None
-    variables: dict[str, VariableStruct]
+    variables: list[str]
 
 
 class JobsRequest(BaseModel):
@@ -81,6 +81,19 @@ class JobsRequest(BaseModel):
 # Helpers
 # ---------------------------------------------------------------------------
 
+_ROUTES = {
+    'health': '/health',
+    'settings': '/settings',
+    'settings_schema': '/settings/schema',
+    'settings_state': '/settings/state',
+    'submit': '/submit',
+    'get': '/get',
+    'variables': '/variables',
+    'jobs': '/jobs',
+    'jobs_next': '/jobs/next',
+    'jobs_by_id': '/jobs/{job_id}',
+}
+
 
 def _numpy_to_native(obj):
     """Recursively convert numpy types to JSON-safe Python natives."""
@@ -131,17 +144,34 @@ class SimpleFastAPIInterfaceServer(BaseInterface):
         ] = {}  # {name: {mode, type, length?, image_size?}}
         self._in_list: list[str] = []
         self._out_list: list[str] = []
+        # (JSON-safe values, encoded body) for GET /variables; reset on
+        # every write to _var_store.
+        self._values_cache: Optional[tuple[dict, bytes]] = None
 
         self._init_variables(config.get('variables', {}))
 
         # -- job state ---------------------------------------------------
         self._jobs: dict[str, dict] = {}
         self._queued: deque = deque()
+        # running job ids in start order (an ordered set), for FIFO completion
+        self._running: dict[str, None] = {}
         self._completed: deque = deque()
 
         # -- monitor callback slot (Stage 2 hook) -----------------------
         self._monitor_callback = None
 
+        # -- static settings (variable metadata never changes) -----------
+        self._settings_schema = _numpy_to_native({
+            'name': self._name,
+            'inputs': self._in_list,
+            'outputs': self._out_list,
+            'variables': self._var_meta,
+            'routes': _ROUTES,
+            'input_queue_max': self._input_queue_max,
+            'output_queue_max': self._output_queue_max,
+        })
+        self._settings_schema_bytes = json.dumps(self._settings_schema).encode()
+
         # -- build FastAPI app ------------------------------------------
         self.app = self._build_app()
 
@@ -277,6 +307,8 @@ class SimpleFastAPIInterfaceServer(BaseInterface):
             # -- Phase 1: pre-validate everything -----------------------
             resolved_jobs: list[tuple[str, dict[str, VariableStruct]]] = []
 
+            # _jobs is keyed by job_id, so duplicate detection stays O(1)
+            # per job regardless of how many jobs are queued or retained.
             seen_ids: set[str] = set()
             for ji in jobs_input:
                 jid = ji.job_id or str(uuid.uuid4())
@@ -339,6 +371,7 @@ class SimpleFastAPIInterfaceServer(BaseInterface):
                     'started_at': None,
                     'completed_at': None,
                     'error': None,
+                    'error_kind': None,
                     'inputs': input_snapshot,
                     'outputs': {},
                 }
@@ -349,6 +382,7 @@ class SimpleFastAPIInterfaceServer(BaseInterface):
                     'status': 'queued',
                     'updated': updated_vars,
                 })
+            self._values_cache = None
 
             # -- Phase 4: fire monitor callback -------------------------
             if self._monitor_callback is not None:
@@ -379,26 +413,28 @@ class SimpleFastAPIInterfaceServer(BaseInterface):
             self._check_mode(name, enforce=enforce)
             coerced = self._coerce_for_type(name, value)
             self._var_store[name] = coerced
+            self._values_cache = None
 
-    def get_many(self, data, **kwargs) -> dict | list[dict]:
+    def get_many(self, data, **kwargs) -> dict | tuple[dict, ...]:
         """Dual-return method.
 
         * ``consume_jobs=True`` with queued jobs → dequeue all, mark running,
-          return a **list of dicts** (one per job with input snapshots).
+          return a **tuple of dicts** (one per job with input snapshots).
         * Otherwise → return a single dict mapping requested names to values.
         """
         consume = kwargs.get('consume_jobs', False)
 
         with self._lock:
             if consume and self._queued:
-                batch: list[dict] = []
-                while self._queued:
-                    jid = self._queued.popleft()
+                jids = tuple(self._queued)
+                self._queued.clear()
+                now = time.time()
+                for jid in jids:
                     job = self._jobs[jid]
                     job['status'] = 'running'
-                    job['started_at'] = time.time()
-                    batch.append(dict(job['inputs']))
-                return batch
+                    job['started_at'] = now
+                self._running.update(dict.fromkeys(jids))
+                return tuple(dict(self._jobs[jid]['inputs']) for jid in jids)
 
             # Transition ONE queued job to running per clock tick.
             # The InterfaceObserver.get_all() calls this without
@@ -410,6 +446,7 @@ class SimpleFastAPIInterfaceServer(BaseInterface):
                 job = self._jobs[jid]
                 job['status'] = 'running'
                 job['started_at'] = time.time()
+                self._running[jid] = None
                 # Restore this job's input values into the variable store
                 # so the pipeline reads the correct inputs for this job.
                 for vname, snap in job['inputs'].items():
@@ -418,6 +455,7 @@ class SimpleFastAPIInterfaceServer(BaseInterface):
                         if not isinstance(snap['value'], np.ndarray)
                         else snap['value'].copy()
                     )
+                self._values_cache = None
 
             # Default path: return current variable values
             if isinstance(data, dict):
@@ -464,16 +502,14 @@ class SimpleFastAPIInterfaceServer(BaseInterface):
                     self._var_store[vname] = coerced
                 except (TypeError, ValueError) as exc:
                     logger.warning(f'put_many: coercion error for {vname}: {exc}')
+            self._values_cache = None
 
             # -- Job completion -----------------------------------------
             # Stage 1 fallback: the pipeline (transformers) strips metadata,
             # so job_id will typically be None.  In that case, FIFO-complete
             # the oldest running job.
-            if not job_id:
-                for candidate_id, candidate_job in self._jobs.items():
-                    if candidate_job['status'] == 'running':
-                        job_id = candidate_id
-                        break
+            if not job_id and self._running:
+                job_id = next(iter(self._running))
 
             if job_id and job_id in self._jobs:
                 job = self._jobs[job_id]
@@ -481,6 +517,7 @@ class SimpleFastAPIInterfaceServer(BaseInterface):
                     now = time.time()
                     job['status'] = 'completed'
                     job['completed_at'] = now
+                    self._running.pop(job_id, None)
                     # Record outputs (snapshot of output variables)
                     for vname in self._out_list:
                         val = self._var_store.get(vname)
@@ -504,6 +541,7 @@ class SimpleFastAPIInterfaceServer(BaseInterface):
                             self._jobs[evicted_id]['error'] = (
                                 'Evicted: output queue overflow'
                             )
+                            self._jobs[evicted_id]['error_kind'] = 'OVERFLOW'
 
     def get_inputs(self) -> list[str]:
         return list(self._in_list)
@@ -550,35 +588,35 @@ class SimpleFastAPIInterfaceServer(BaseInterface):
         @app.get('/settings')
         def settings():
             with self._lock:
+                body = dict(self._settings_schema)
                 variables_meta = {}
-                for name, meta in self._var_meta.items():
-                    entry = dict(meta)
+                for name, entry in body['variables'].items():
+                    entry = dict(entry)
                     # include current value (JSON-safe)
                     entry['current'] = _numpy_to_native(self._var_store.get(name))
                     variables_meta[name] = entry
+                body['variables'] = variables_meta
+                return body
 
-                return _numpy_to_native({
-                    'name': self._name,
-                    'inputs': self._in_list,
-                    'outputs': self._out_list,
-                    'variables': variables_meta,
-                    'routes': {
-                        'health': '/health',
-                        'settings': '/settings',
-                        'submit': '/submit',
-                        'get': '/get',
-                        'jobs': '/jobs',
-                        'jobs_next': '/jobs/next',
-                        'jobs_by_id': '/jobs/{job_id}',
-                    },
-                    'input_queue_max': self._input_queue_max,
-                    'output_queue_max': self._output_queue_max,
-                })
+        @app.get('/settings/schema')
+        def settings_schema():
+            return Response(
+                content=self._settings_schema_bytes, media_type='application/json'
+            )
+
+        @app.get('/settings/state')
+        def settings_state():
+            with self._lock:
+                return {
+                    'variables': {
+                        name: {'current': _numpy_to_native(val)}
+                        for name, val in self._var_store.items()
+                    }
+                }
 
         @app.post('/submit')
         def submit(req: SubmitRequest):
-            ji = JobInput(job_id=req.job_id, variables=req.variables)
-            accepted = self._enqueue_jobs([ji])
+            accepted = self._enqueue_jobs([req])
             item = accepted[0]
             return {
                 'job_id': item['job_id'],
@@ -601,6 +639,30 @@ class SimpleFastAPIInterfaceServer(BaseInterface):
                     'values': values,
                 })
 
+        @app.get('/variables')
+        def get_variables(names: Optional[str] = None):
+            """Bulk read; *names* is a comma-separated subset (default: all)."""
+            with self._lock:
+                if self._values_cache is None:
+                    values = {
+                        vname: {'value': _numpy_to_native(val)}
+                        for vname, val in self._var_store.items()
+                    }
+                    # allow_nan=False, like the JSONResponse of every other route
+                    body = json.dumps({'values': values}, allow_nan=False).encode()
+                    self._values_cache = (values, body)
+                values, body = self._values_cache
+
+                requested = [vname for vname in (names or '').split(',') if vname]
+                if not requested:
+                    return Response(content=body, media_type='application/json')
+                for vname in requested:
+                    if vname not in values:
+                        raise HTTPException(
+                            status_code=404, detail=f'Unknown variable: {vname}'
+                        )
+                return {'values': {vname: values[vname] for vname in requested}}
+
         @app.post('/jobs')
         def submit_batch(req: JobsRequest):
             accepted = self._enqueue_jobs(req.jobs)
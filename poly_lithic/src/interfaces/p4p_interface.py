@@ -174,7 +174,8 @@ class SimplePVAInterface(BaseInterface):
 
     @staticmethod
     def _coerce_client_value(value: Any) -> Any:
-        if isinstance(value, np.ndarray):
+        # 1-D arrays go straight to NTScalar array PVs; only images need NTNDArray
+        if isinstance(value, np.ndarray) and value.ndim >= 2:
             return NTNDArray().wrap(value)
         return value
 
@@ -18,14 +18,45 @@ my_model_getter = "my_package.models:MyModelGetter"
 
 from typing import Any
 from importlib.metadata import entry_points
+import functools
 import logging
+import sys
 
 logger = logging.getLogger(__name__)
 
 
+@functools.cache
+def _entry_point_index():
+    """Return installed entry points grouped as ``{group: {name: entry_point}}``.
+
+    Distribution metadata is scanned once and shared by every registry; call
+    ``_entry_point_index.cache_clear()`` to pick up packages installed later.
+    """
+    eps = entry_points()
+    # .groups and .select() exist on both the SelectableGroups that
+    # entry_points() returns before Python 3.12 and the EntryPoints it
+    # returns from 3.12 on, so this needs no version branch.
+    index = {}
+    for group in eps.groups:
+        # names read from metadata aren't interned; interned keys let lookups
+        # with string literals match on identity. A later duplicate name
+        # replaces an earlier one.
+        index[group] = {sys.intern(ep.name): ep for ep in eps.select(group=group)}
+    return index
+
+
 class PluginRegistry:
     """Registry for dynamically discovered plugins via entry points."""
 
+    __slots__ = (
+        'group_name',
+        'entry_point_group',
+        '_plugins',
+        '_entry_points',
+        '_discovered',
+        '_loaded',
+    )
+
     def __init__(self, group_name: str):
         self.group_name = group_name
         self.entry_point_group = group_name
@@ -38,16 +69,21 @@ class PluginRegistry:
         if self._discovered:
             return
 
-        discovered = entry_points(group=self.group_name)
-        for ep in discovered:
-            self._entry_points[ep.name] = ep
-            self._loaded[ep.name] = False
-            logger.debug(f'Discovered plugin: {ep.name}')
+        discovered = _entry_point_index().get(self.group_name, {})
+        for name, ep in discovered.items():
+            # entry points are only recorded here; get() loads them on first use
+            self._entry_points.setdefault(name, ep)
+            self._loaded.setdefault(name, False)
+            logger.debug(f'Discovered plugin: {name}')
 
         self._discovered = True
 
     def register(self, name: str, plugin_class):
+        name = sys.intern(name)
         self._plugins[name] = plugin_class
+        # a manual registration replaces any discovered entry point of that name
+        self._entry_points.pop(name, None)
+        self._loaded.pop(name, None)
         logger.info(f'Registered plugin: {name}')
 
     def has_plugin(self, name: str) -> bool:
@@ -61,7 +97,7 @@ class PluginRegistry:
     def list_plugins(self):
         if not self._discovered:
             self.discover_plugins()
-        return list(set(self._plugins.keys()) | set(self._entry_points.keys()))
+        return list(self._plugins.keys() | self._entry_points.keys())
 
     def unregister(self, name: str):
         if name in self._plugins:
@@ -87,6 +123,9 @@ class PluginRegistry:
                 logger.debug(f'Loaded plugin: {name}')
                 return plugin_class
             except Exception as e:
+                # drop the broken entry point so later lookups don't retry it
+                del self._entry_points[name]
+                self._loaded.pop(name, None)
                 logger.error(f'Failed to load plugin {name}: {e}')
                 raise
 
@@ -101,17 +140,17 @@ class PluginRegistry:
     def __iter__(self):
         if not self._discovered:
             self.discover_plugins()
-        return iter(set(self._plugins.keys()) | set(self._entry_points.keys()))
+        return iter(self._plugins.keys() | self._entry_points.keys())
 
     def __len__(self) -> int:
         if not self._discovered:
             self.discover_plugins()
-        return len(set(self._plugins.keys()) | set(self._entry_points.keys()))
+        return len(self._plugins.keys() | self._entry_points.keys())
 
     def keys(self):
         if not self._discovered:
             self.discover_plugins()
-        return set(self._plugins.keys()) | set(self._entry_points.keys())
+        return self._plugins.keys() | self._entry_points.keys()
 
     def values(self):
         if not self._discovered:
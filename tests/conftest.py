@@ -0,0 +1,30 @@
+# SPDX-FileCopyrightText: Copyright 2025 UK Research and Innovation,
+# Science and Technology Facilities Council, ISIS
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Shared pytest hooks."""
+
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--run-slow',
+        action='store_true',
+        default=False,
+        help='also run tests marked slow',
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'slow: slow test, only run with --run-slow')
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption('--run-slow'):
+        return
+    skip_slow = pytest.mark.skip(reason='slow test, use --run-slow to run')
+    for item in items:
+        if 'slow' in item.keywords:
+            item.add_marker(skip_slow)
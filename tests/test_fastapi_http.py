@@ -19,6 +19,35 @@ from poly_lithic.src.interfaces.fastapi_interface import SimpleFastAPIInterfaceS
 # Fixtures
 # ---------------------------------------------------------------------------
 
+# (method, path, json body) — one request per route so routing, validation and
+# exception handlers are all exercised once before the real tests run.
+_WARMUP_ROUTES = [
+    ('GET', '/health', None),
+    ('GET', '/settings', None),
+    ('GET', '/settings/schema', None),
+    ('GET', '/settings/state', None),
+    ('POST', '/submit', {'job_id': 'warmup', 'variables': {'A': {'value': 1.0}}}),
+    ('POST', '/get', {'variables': ['A']}),
+    ('GET', '/variables', None),
+    ('POST', '/jobs', {'jobs': [{'variables': {'A': {'value': 2.0}}}]}),
+    ('GET', '/jobs/warmup', None),
+    ('GET', '/jobs/next', None),
+]
+
+
+@pytest.fixture(scope='session', autouse=True)
+def _warmup():
+    """Hit every route once on a throwaway server so tests see steady-state cost."""
+    server = SimpleFastAPIInterfaceServer({
+        'name': 'http_warmup',
+        'start_server': False,
+        'variables': {'A': {'mode': 'in', 'type': 'scalar', 'default': 1.0}},
+    })
+    with TestClient(server.app, follow_redirects=False) as tc:
+        for method, path, body in _WARMUP_ROUTES:
+            tc.request(method, path, json=body)
+    server.close()
+
 
 @pytest.fixture
 def iface():
@@ -42,7 +71,10 @@ def iface():
 
 @pytest.fixture
 def client(iface):
-    return TestClient(iface.app)
+    # Entering the client keeps one event-loop portal alive for every request
+    # in the test instead of spinning one up per call.
+    with TestClient(iface.app, follow_redirects=False) as tc:
+        yield tc
 
 
 # ---------------------------------------------------------------------------
@@ -66,7 +98,7 @@ class TestHealth:
 
 class TestSettings:
     def test_settings_structure(self, client):
-        r = client.get('/settings')
+        r = client.get('/settings/schema')
         assert r.status_code == 200
         body = r.json()
         assert 'inputs' in body
@@ -75,6 +107,20 @@ class TestSettings:
         assert 'routes' in body
         assert 'A' in body['inputs']
         assert 'C' in body['outputs']
+        assert 'current' not in body['variables']['A']
+
+    def test_settings_state(self, client, iface):
+        iface.put('A', 99.0)
+        r = client.get('/settings/state')
+        assert r.status_code == 200
+        variables = r.json()['variables']
+        assert variables['A']['current'] == 99.0
+        assert variables['B']['current'] == [10, 20, 30]
+
+    def test_settings_combines_schema_and_state(self, client):
+        body = client.get('/settings').json()
+        assert body['routes'] == client.get('/settings/schema').json()['routes']
+        assert body['variables']['A']['current'] == 1.0
 
     def test_settings_variable_meta(self, client):
         r = client.get('/settings')
@@ -113,34 +159,25 @@ class TestSubmit:
         assert r.status_code == 200
         assert r.json()['job_id'] == 'my-job'
 
-    def test_submit_unknown_variable(self, client):
-        r = client.post(
-            '/submit',
-            json={
-                'variables': {'NONEXISTENT': {'value': 1.0}},
-            },
-        )
-        assert r.status_code == 404
-
-    def test_submit_write_to_output(self, client):
-        r = client.post(
-            '/submit',
-            json={
-                'variables': {'C': {'value': 1.0}},
-            },
-        )
-        assert r.status_code == 403
-
-    def test_submit_type_error(self, client):
-        r = client.post(
-            '/submit',
-            json={
-                'variables': {'A': {'value': 'not_a_number'}},
-            },
-        )
-        assert r.status_code == 422
-
-    def test_submit_duplicate_job_id(self, client):
+    @pytest.mark.parametrize(
+        'payload, status_code',
+        [
+            ({'variables': {'NONEXISTENT': {'value': 1.0}}}, 404),
+            ({'variables': {'C': {'value': 1.0}}}, 403),
+            ({'variables': {'A': {'value': 'not_a_number'}}}, 422),
+            ({'variables': {'A': {'value': 1.0, 'extra_field': 'bad'}}}, 422),
+            ({'job_id': 'dup', 'variables': {'A': {'value': 2.0}}}, 409),
+        ],
+        ids=[
+            'unknown_variable',
+            'write_to_output',
+            'type_error',
+            'extra_field_rejected',
+            'duplicate_job_id',
+        ],
+    )
+    def test_submit_errors(self, client, payload, status_code):
+        # seed job so the duplicate case has something to collide with
         client.post(
             '/submit',
             json={
@@ -148,23 +185,7 @@ class TestSubmit:
                 'variables': {'A': {'value': 1.0}},
             },
         )
-        r = client.post(
-            '/submit',
-            json={
-                'job_id': 'dup',
-                'variables': {'A': {'value': 2.0}},
-            },
-        )
-        assert r.status_code == 409
-
-    def test_submit_extra_field_rejected(self, client):
-        r = client.post(
-            '/submit',
-            json={
-                'variables': {'A': {'value': 1.0, 'extra_field': 'bad'}},
-            },
-        )
-        assert r.status_code == 422
+        assert client.post('/submit', json=payload).status_code == status_code
 
     def test_submit_queue_full(self, client):
         # input_queue_max=5
@@ -244,6 +265,77 @@ class TestGetEndpoint:
         assert r.json()['values']['A']['value'] == 99.0
 
 
+# ---------------------------------------------------------------------------
+# GET /variables (bulk)
+# ---------------------------------------------------------------------------
+
+
+class TestVariablesEndpoint:
+    def test_bulk_get(self, client):
+        r = client.get('/variables', params={'names': 'A,B,D'})
+        assert r.status_code == 200
+        values = r.json()['values']
+        assert values == {
+            'A': {'value': 1.0},
+            'B': {'value': [10, 20, 30]},
+            'D': {'value': 5.0},
+        }
+
+    def test_all_variables_by_default(self, client):
+        r = client.get('/variables')
+        assert r.status_code == 200
+        assert set(r.json()['values']) == {'A', 'B', 'C', 'D'}
+
+    def test_unknown_variable(self, client):
+        r = client.get('/variables', params={'names': 'A,NONEXISTENT'})
+        assert r.status_code == 404
+
+    def test_reflects_writes(self, client, iface):
+        client.get('/variables')  # populate the cache
+        iface.put('A', 99.0)
+        client.post('/submit', json={'variables': {'D': {'value': 7.0}}})
+        values = client.get('/variables', params={'names': 'A,D'}).json()['values']
+        assert values['A']['value'] == 99.0
+        assert values['D']['value'] == 7.0
+
+    @pytest.mark.parametrize(
+        'names, expected',
+        [
+            ('A,', {'A'}),
+            (',A', {'A'}),
+            ('A,,D', {'A', 'D'}),
+            (',', {'A', 'B', 'C', 'D'}),
+        ],
+    )
+    def test_empty_names_ignored(self, client, names, expected):
+        r = client.get('/variables', params={'names': names})
+        assert r.status_code == 200
+        assert set(r.json()['values']) == expected
+
+    @pytest.mark.parametrize('params', [None, {'names': 'A'}], ids=['all', 'names'])
+    def test_nan_rejected(self, iface, params):
+        # both the cached full read and the ?names= read refuse invalid JSON
+        iface.put('A', float('nan'))
+        with TestClient(iface.app, raise_server_exceptions=False) as tc:
+            r = tc.get('/variables', params=params)
+        assert r.status_code == 500
+
+    def test_cache_dropped_after_put_many(self, client, iface):
+        client.get('/variables')  # populate the cache
+        iface.put_many({'C': {'value': 3.0}, 'D': {'value': 4.0}})
+        values = client.get('/variables').json()['values']
+        assert values['C']['value'] == 3.0
+        assert values['D']['value'] == 4.0
+
+    def test_cache_dropped_after_clock_driven_restore(self, client, iface):
+        client.post('/submit', json={'variables': {'A': {'value': 7.0}}})
+        iface.put('A', 2.0)
+        assert client.get('/variables').json()['values']['A']['value'] == 2.0
+        # promoting the queued job restores its inputs into the store
+        iface.get_many(iface.get_inputs())
+        assert client.get('/variables').json()['values']['A']['value'] == 7.0
+
+
 # ---------------------------------------------------------------------------
 # POST /jobs (batch)
 # ---------------------------------------------------------------------------
@@ -264,17 +356,17 @@ class TestJobsBatch:
         body = r.json()
         assert len(body['accepted']) == 2
 
-    def test_batch_duplicate_within(self, client):
-        r = client.post(
-            '/jobs',
-            json={
-                'jobs': [
-                    {'job_id': 'same', 'variables': {'A': {'value': 1.0}}},
-                    {'job_id': 'same', 'variables': {'A': {'value': 2.0}}},
-                ],
-            },
-        )
+    def test_batch_duplicate_within(self, client, iface):
+        """A single duplicate at the tail of a large batch is still caught."""
+        jobs = [
+            {'job_id': f'job-{i}', 'variables': {'A': {'value': float(i)}}}
+            for i in range(100)
+        ]
+        jobs.append({'job_id': 'job-0', 'variables': {'A': {'value': 2.0}}})
+        r = client.post('/jobs', json={'jobs': jobs})
         assert r.status_code == 409
+        assert 'job-0' in r.json()['detail']
+        assert len(iface._queued) == 0
 
     def test_batch_atomic_validation(self, client, iface):
         """If second job has bad variable, nothing should be enqueued."""
@@ -394,7 +486,7 @@ class TestJobRoundTrip:
 
         # 2. Consume jobs (simulates InterfaceObserver.get_all path)
         batch = iface.get_many([], consume_jobs=True)
-        assert isinstance(batch, list)
+        assert isinstance(batch, tuple)
         assert len(batch) == 1
 
         # 3. Pipeline writes output
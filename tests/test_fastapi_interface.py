@@ -5,12 +5,22 @@
 
 """Unit tests for SimpleFastAPIInterfaceServer (no HTTP layer)."""
 
+import copy
 import time
 
 import numpy as np
 import pytest
+from fastapi import HTTPException as FastHTTPException
 
-from poly_lithic.src.interfaces.fastapi_interface import SimpleFastAPIInterfaceServer
+from poly_lithic.src.interfaces.fastapi_interface import (
+    JobInput,
+    SimpleFastAPIInterfaceServer,
+    VariableStruct,
+)
+
+# Read-only image inputs shared across tests.
+_IMG_2x3 = np.ones((2, 3))
+_IMG_3x3 = np.ones((3, 3))
 
 
 # ---------------------------------------------------------------------------
@@ -18,22 +28,73 @@ from poly_lithic.src.interfaces.fastapi_interface import SimpleFastAPIInterfaceS
 # ---------------------------------------------------------------------------
 
 
+_DEFAULT_CFG = {
+    'name': 'test_fastapi',
+    'start_server': False,  # never launch uvicorn in unit tests
+    'variables': {
+        'INPUT_A': {'mode': 'in', 'type': 'scalar', 'default': 1.0},
+        'INPUT_B': {'mode': 'in', 'type': 'array', 'default': [1, 2, 3]},
+        'OUTPUT_X': {'mode': 'out', 'type': 'scalar', 'default': 0.0},
+        'INOUT_Y': {'mode': 'inout', 'type': 'scalar', 'default': 5.0},
+    },
+}
+
+
 def _make_config(**overrides):
-    """Return a minimal config dict, merging any *overrides*."""
-    cfg = {
-        'name': 'test_fastapi',
-        'start_server': False,  # never launch uvicorn in unit tests
-        'variables': {
-            'INPUT_A': {'mode': 'in', 'type': 'scalar', 'default': 1.0},
-            'INPUT_B': {'mode': 'in', 'type': 'array', 'default': [1, 2, 3]},
-            'OUTPUT_X': {'mode': 'out', 'type': 'scalar', 'default': 0.0},
-            'INOUT_Y': {'mode': 'inout', 'type': 'scalar', 'default': 5.0},
-        },
-    }
+    """Return a copy of the minimal config, merging any *overrides*."""
+    cfg = copy.deepcopy(_DEFAULT_CFG)
     cfg.update(overrides)
     return cfg
 
 
+def _job(value, job_id=None):
+    """Build a known-good ``JobInput`` for ``INPUT_A`` without validation."""
+    return JobInput.model_construct(
+        job_id=job_id,
+        variables={'INPUT_A': VariableStruct.model_construct(value=value)},
+    )
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(scope='module')
+def _shared_iface():
+    iface = SimpleFastAPIInterfaceServer(_make_config())
+    yield iface
+    iface.close()
+
+
+@pytest.fixture
+def iface(request):
+    """Fresh interface, closed on teardown.
+
+    Uses the default config unless one is passed via indirect parametrize.
+    """
+    cfg = getattr(request, 'param', None) or _make_config()
+    server = SimpleFastAPIInterfaceServer(cfg)
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def default_iface(_shared_iface):
+    """Module-wide interface with the default config, reset after each test."""
+    iface = _shared_iface
+    store = dict(iface._var_store)
+    yield iface
+    iface._var_store.clear()
+    iface._var_store.update(store)
+    iface._values_cache = None
+    iface._jobs.clear()
+    iface._queued.clear()
+    iface._running.clear()
+    iface._completed.clear()
+    iface._monitor_callback = None
+
+
 # ---------------------------------------------------------------------------
 # Initialisation
 # ---------------------------------------------------------------------------
@@ -43,81 +104,87 @@ class TestInitialisation:
     def test_class_exists(self):
         assert SimpleFastAPIInterfaceServer is not None
 
-    def test_scalar_defaults(self):
-        iface = SimpleFastAPIInterfaceServer(_make_config())
+    def test_scalar_defaults(self, iface):
         _, val = iface.get('INPUT_A')
         assert val['value'] == 1.0
-        iface.close()
 
-    def test_array_defaults(self):
-        iface = SimpleFastAPIInterfaceServer(_make_config())
+    def test_array_defaults(self, iface):
         _, val = iface.get('INPUT_B')
-        np.testing.assert_array_equal(val['value'], [1, 2, 3])
-        iface.close()
-
-    def test_array_zeros_default(self):
-        cfg = _make_config(
-            variables={
-                'ARR': {'mode': 'in', 'type': 'waveform', 'length': 5},
-            }
-        )
-        iface = SimpleFastAPIInterfaceServer(cfg)
+        assert val['value'].tolist() == [1, 2, 3]
+
+    @pytest.mark.parametrize(
+        'iface',
+        [
+            _make_config(
+                variables={
+                    'ARR': {'mode': 'in', 'type': 'waveform', 'length': 5},
+                }
+            )
+        ],
+        indirect=True,
+    )
+    def test_array_zeros_default(self, iface):
         _, val = iface.get('ARR')
-        np.testing.assert_array_equal(val['value'], np.zeros(5))
-        iface.close()
-
-    def test_image_defaults(self):
-        cfg = _make_config(
-            variables={
-                'IMG': {'mode': 'in', 'type': 'image', 'image_size': {'x': 4, 'y': 3}},
-            }
-        )
-        iface = SimpleFastAPIInterfaceServer(cfg)
+        a = val['value']
+        assert a.shape == (5,) and not a.any()
+
+    @pytest.mark.parametrize(
+        'iface',
+        [
+            _make_config(
+                variables={
+                    'IMG': {
+                        'mode': 'in',
+                        'type': 'image',
+                        'image_size': {'x': 4, 'y': 3},
+                    },
+                }
+            )
+        ],
+        indirect=True,
+    )
+    def test_image_defaults(self, iface):
         _, val = iface.get('IMG')
         assert val['value'].shape == (3, 4)
-        iface.close()
 
-    def test_image_custom_default_raises(self):
-        cfg = _make_config(
-            variables={
-                'IMG': {
-                    'mode': 'in',
-                    'type': 'image',
-                    'image_size': {'x': 2, 'y': 2},
-                    'default': [[1, 2], [3, 4]],
+    @pytest.mark.parametrize(
+        'variables, exc',
+        [
+            pytest.param(
+                {
+                    'IMG': {
+                        'mode': 'in',
+                        'type': 'image',
+                        'image_size': {'x': 2, 'y': 2},
+                        'default': [[1, 2], [3, 4]],
+                    },
                 },
-            }
-        )
-        with pytest.raises(NotImplementedError):
-            SimpleFastAPIInterfaceServer(cfg)
-
-    def test_unknown_type_raises(self):
-        cfg = _make_config(
-            variables={
-                'BAD': {'mode': 'in', 'type': 'unknown'},
-            }
-        )
-        with pytest.raises(TypeError):
-            SimpleFastAPIInterfaceServer(cfg)
-
-    def test_invalid_mode_raises(self):
-        cfg = _make_config(
-            variables={
-                'BAD': {'mode': 'readwrite', 'type': 'scalar'},
-            }
-        )
-        with pytest.raises(ValueError):
-            SimpleFastAPIInterfaceServer(cfg)
-
-    def test_input_output_lists(self):
-        iface = SimpleFastAPIInterfaceServer(_make_config())
+                NotImplementedError,
+                id='image_custom_default',
+            ),
+            pytest.param(
+                {'BAD': {'mode': 'in', 'type': 'unknown'}},
+                TypeError,
+                id='unknown_type',
+            ),
+            pytest.param(
+                {'BAD': {'mode': 'readwrite', 'type': 'scalar'}},
+                ValueError,
+                id='invalid_mode',
+            ),
+        ],
+    )
+    def test_bad_config_raises(self, variables, exc):
+        with pytest.raises(exc):
+            SimpleFastAPIInterfaceServer(_make_config(variables=variables))
+
+    def test_input_output_lists(self, iface):
         assert 'INPUT_A' in iface.get_inputs()
         assert 'INPUT_B' in iface.get_inputs()
         assert 'INOUT_Y' in iface.get_inputs()
         assert 'OUTPUT_X' in iface.get_outputs()
         assert 'INOUT_Y' in iface.get_outputs()
         assert 'INPUT_A' not in iface.get_outputs()
-        iface.close()
 
 
 # ---------------------------------------------------------------------------
@@ -126,33 +193,25 @@ class TestInitialisation:
 
 
 class TestScalarPutGet:
-    def test_put_and_get(self):
-        iface = SimpleFastAPIInterfaceServer(_make_config())
-        iface.put('INPUT_A', 42.0)
-        _, val = iface.get('INPUT_A')
+    def test_put_and_get(self, default_iface):
+        default_iface.put('INPUT_A', 42.0)
+        _, val = default_iface.get('INPUT_A')
         assert val['value'] == 42.0
-        iface.close()
 
-    def test_put_bool(self):
-        iface = SimpleFastAPIInterfaceServer(_make_config())
-        iface.put('INPUT_A', True)
-        _, val = iface.get('INPUT_A')
+    def test_put_bool(self, default_iface):
+        default_iface.put('INPUT_A', True)
+        _, val = default_iface.get('INPUT_A')
         assert val['value'] is True
-        iface.close()
 
-    def test_put_numpy_scalar(self):
-        iface = SimpleFastAPIInterfaceServer(_make_config())
-        iface.put('INPUT_A', np.float64(3.14))
-        _, val = iface.get('INPUT_A')
+    def test_put_numpy_scalar(self, default_iface):
+        default_iface.put('INPUT_A', np.float64(3.14))
+        _, val = default_iface.get('INPUT_A')
         assert isinstance(val['value'], float)
         assert abs(val['value'] - 3.14) < 1e-9
-        iface.close()
 
-    def test_put_string_raises(self):
-        iface = SimpleFastAPIInterfaceServer(_make_config())
+    def test_put_string_raises(self, default_iface):
         with pytest.raises(TypeError):
-            iface.put('INPUT_A', 'not_a_number')
-        iface.close()
+            default_iface.put('INPUT_A', 'not_a_number')
 
 
 # ---------------------------------------------------------------------------
@@ -161,31 +220,23 @@ class TestScalarPutGet:
 
 
 class TestArrayPutGet:
-    def test_put_list(self):
-        iface = SimpleFastAPIInterfaceServer(_make_config())
-        iface.put('INPUT_B', [10, 20, 30])
-        _, val = iface.get('INPUT_B')
-        np.testing.assert_array_equal(val['value'], [10, 20, 30])
-        iface.close()
+    def test_put_list(self, default_iface):
+        default_iface.put('INPUT_B', [10, 20, 30])
+        _, val = default_iface.get('INPUT_B')
+        assert val['value'].tolist() == [10, 20, 30]
 
-    def test_put_numpy(self):
-        iface = SimpleFastAPIInterfaceServer(_make_config())
-        iface.put('INPUT_B', np.array([7, 8, 9]))
-        _, val = iface.get('INPUT_B')
-        np.testing.assert_array_equal(val['value'], [7, 8, 9])
-        iface.close()
+    def test_put_numpy(self, default_iface):
+        default_iface.put('INPUT_B', np.array([7, 8, 9]))
+        _, val = default_iface.get('INPUT_B')
+        assert val['value'].tolist() == [7, 8, 9]
 
-    def test_wrong_length_raises(self):
-        iface = SimpleFastAPIInterfaceServer(_make_config())
+    def test_wrong_length_raises(self, default_iface):
         with pytest.raises(ValueError):
-            iface.put('INPUT_B', [1, 2])  # expects length 3
-        iface.close()
+            default_iface.put('INPUT_B', [1, 2])  # expects length 3
 
-    def test_2d_raises(self):
-        iface = SimpleFastAPIInterfaceServer(_make_config())
+    def test_2d_raises(self, default_iface):
         with pytest.raises(ValueError):
-            iface.put('INPUT_B', [[1, 2, 3]])
-        iface.close()
+            default_iface.put('INPUT_B', [[1, 2, 3]])
 
 
 # ---------------------------------------------------------------------------
@@ -194,40 +245,63 @@ class TestArrayPutGet:
 
 
 class TestImagePutGet:
-    def test_put_and_get_image(self):
-        cfg = _make_config(
-            variables={
-                'IMG': {'mode': 'in', 'type': 'image', 'image_size': {'x': 3, 'y': 2}},
-            }
-        )
-        iface = SimpleFastAPIInterfaceServer(cfg)
-        img = np.ones((2, 3))
-        iface.put('IMG', img)
+    @pytest.mark.parametrize(
+        'iface',
+        [
+            _make_config(
+                variables={
+                    'IMG': {
+                        'mode': 'in',
+                        'type': 'image',
+                        'image_size': {'x': 3, 'y': 2},
+                    },
+                }
+            )
+        ],
+        indirect=True,
+    )
+    def test_put_and_get_image(self, iface):
+        iface.put('IMG', _IMG_2x3)
         _, val = iface.get('IMG')
-        np.testing.assert_array_equal(val['value'], img)
-        iface.close()
-
-    def test_wrong_shape_raises(self):
-        cfg = _make_config(
-            variables={
-                'IMG': {'mode': 'in', 'type': 'image', 'image_size': {'x': 3, 'y': 2}},
-            }
-        )
-        iface = SimpleFastAPIInterfaceServer(cfg)
+        assert np.array_equal(val['value'], _IMG_2x3)
+
+    @pytest.mark.parametrize(
+        'iface',
+        [
+            _make_config(
+                variables={
+                    'IMG': {
+                        'mode': 'in',
+                        'type': 'image',
+                        'image_size': {'x': 3, 'y': 2},
+                    },
+                }
+            )
+        ],
+        indirect=True,
+    )
+    def test_wrong_shape_raises(self, iface):
         with pytest.raises(ValueError):
-            iface.put('IMG', np.ones((3, 3)))  # wrong shape
-        iface.close()
-
-    def test_1d_raises(self):
-        cfg = _make_config(
-            variables={
-                'IMG': {'mode': 'in', 'type': 'image', 'image_size': {'x': 3, 'y': 2}},
-            }
-        )
-        iface = SimpleFastAPIInterfaceServer(cfg)
+            iface.put('IMG', _IMG_3x3)  # wrong shape
+
+    @pytest.mark.parametrize(
+        'iface',
+        [
+            _make_config(
+                variables={
+                    'IMG': {
+                        'mode': 'in',
+                        'type': 'image',
+                        'image_size': {'x': 3, 'y': 2},
+                    },
+                }
+            )
+        ],
+        indirect=True,
+    )
+    def test_1d_raises(self, iface):
         with pytest.raises(ValueError):
             iface.put('IMG', [1, 2, 3, 4, 5, 6])
-        iface.close()
 
 
 # ---------------------------------------------------------------------------
@@ -236,25 +310,19 @@ class TestImagePutGet:
 
 
 class TestModeEnforcement:
-    def test_write_to_output_raises(self):
-        iface = SimpleFastAPIInterfaceServer(_make_config())
+    def test_write_to_output_raises(self, iface):
         with pytest.raises(PermissionError):
             iface.put('OUTPUT_X', 99.0)
-        iface.close()
 
-    def test_write_to_output_with_enforce_false(self):
-        iface = SimpleFastAPIInterfaceServer(_make_config())
+    def test_write_to_output_with_enforce_false(self, iface):
         iface.put('OUTPUT_X', 99.0, enforce_mode=False)
         _, val = iface.get('OUTPUT_X')
         assert val['value'] == 99.0
-        iface.close()
 
-    def test_write_to_inout_ok(self):
-        iface = SimpleFastAPIInterfaceServer(_make_config())
+    def test_write_to_inout_ok(self, iface):
         iface.put('INOUT_Y', 10.0)
         _, val = iface.get('INOUT_Y')
         assert val['value'] == 10.0
-        iface.close()
 
 
 # ---------------------------------------------------------------------------
@@ -263,20 +331,16 @@ class TestModeEnforcement:
 
 
 class TestGetMany:
-    def test_get_many_returns_dict(self):
-        iface = SimpleFastAPIInterfaceServer(_make_config())
-        result = iface.get_many(['INPUT_A', 'INOUT_Y'])
+    def test_get_many_returns_dict(self, default_iface):
+        result = default_iface.get_many(['INPUT_A', 'INOUT_Y'])
         assert isinstance(result, dict)
         assert result['INPUT_A']['value'] == 1.0
         assert result['INOUT_Y']['value'] == 5.0
-        iface.close()
 
-    def test_get_many_consume_no_jobs(self):
-        iface = SimpleFastAPIInterfaceServer(_make_config())
-        result = iface.get_many([], consume_jobs=True)
+    def test_get_many_consume_no_jobs(self, default_iface):
+        result = default_iface.get_many([], consume_jobs=True)
         # no queued jobs → returns dict (fallback path)
         assert isinstance(result, dict)
-        iface.close()
 
 
 # ---------------------------------------------------------------------------
@@ -286,128 +350,101 @@ class TestGetMany:
 
 class TestJobLifecycle:
     def _submit_one(self, iface, value=2.0, job_id=None):
-        from poly_lithic.src.interfaces.fastapi_interface import (
-            JobInput,
-            VariableStruct,
-        )
+        return iface._enqueue_jobs([_job(value, job_id)])
 
-        ji = JobInput(
-            job_id=job_id,
-            variables={'INPUT_A': VariableStruct(value=value)},
-        )
-        return iface._enqueue_jobs([ji])
-
-    def test_submit_and_queued(self):
-        iface = SimpleFastAPIInterfaceServer(_make_config())
+    def test_submit_and_queued(self, iface):
         accepted = self._submit_one(iface)
         assert len(accepted) == 1
         assert accepted[0]['status'] == 'queued'
         jid = accepted[0]['job_id']
         assert iface._jobs[jid]['status'] == 'queued'
-        iface.close()
 
-    def test_consume_jobs_returns_list(self):
-        iface = SimpleFastAPIInterfaceServer(_make_config())
+    def test_consume_jobs_returns_tuple(self, iface):
         self._submit_one(iface, value=7.0)
         batch = iface.get_many([], consume_jobs=True)
-        assert isinstance(batch, list)
+        assert isinstance(batch, tuple)
         assert len(batch) == 1
         assert batch[0]['INPUT_A']['value'] == 7.0
-        iface.close()
 
-    def test_job_running_after_consume(self):
-        iface = SimpleFastAPIInterfaceServer(_make_config())
+    def test_job_running_after_consume(self, iface):
         accepted = self._submit_one(iface)
         jid = accepted[0]['job_id']
         iface.get_many([], consume_jobs=True)
         assert iface._jobs[jid]['status'] == 'running'
-        iface.close()
 
-    def test_job_running_after_clock_driven_get_many(self):
+    def test_job_running_after_clock_driven_get_many(self, iface):
         """Default get_many (no consume_jobs) transitions queued→running."""
-        iface = SimpleFastAPIInterfaceServer(_make_config())
         accepted = self._submit_one(iface)
         jid = accepted[0]['job_id']
         # simulate clock-driven get_all path
         iface.get_many(iface.get_inputs())
         assert iface._jobs[jid]['status'] == 'running'
-        iface.close()
 
-    def test_put_many_completes_job(self):
-        iface = SimpleFastAPIInterfaceServer(_make_config())
-        accepted = self._submit_one(iface)
-        jid = accepted[0]['job_id']
-        iface.get_many([], consume_jobs=True)
+    @pytest.mark.parametrize(
+        'with_metadata',
+        [
+            pytest.param(True, id='metadata'),
+            # clock-driven pipeline: transformers strip metadata, so the
+            # oldest running job is FIFO-completed
+            pytest.param(False, id='fifo_without_metadata'),
+        ],
+    )
+    def test_put_many_completes_job(self, iface, with_metadata):
+        jid = self._submit_one(iface)[0]['job_id']
+        iface.get_many(iface.get_inputs())
+        assert iface._jobs[jid]['status'] == 'running'
+
+        output = {'value': 42.0, 'timestamp': time.time()}
+        if with_metadata:
+            output['metadata'] = {'trace': {'job_id': jid}}
+        iface.put_many({'OUTPUT_X': output})
 
-        # simulate pipeline output with job_id in metadata
-        iface.put_many({
-            'OUTPUT_X': {
-                'value': 42.0,
-                'timestamp': time.time(),
-                'metadata': {'trace': {'job_id': jid}},
-            },
-        })
         assert iface._jobs[jid]['status'] == 'completed'
         assert iface._jobs[jid]['outputs']['OUTPUT_X']['value'] == 42.0
-        iface.close()
+        assert jid in iface._completed
+        assert jid not in iface._running
 
-    def test_put_many_fifo_completes_without_metadata(self):
-        """Clock-driven pipeline: put_many with no job_id in metadata
-        should FIFO-complete the oldest running job."""
-        iface = SimpleFastAPIInterfaceServer(_make_config())
-        accepted = self._submit_one(iface, value=3.0)
-        jid = accepted[0]['job_id']
-        # clock-driven transition: queued → running
+    def test_put_many_fifo_completes_in_start_order(self, iface):
+        first = self._submit_one(iface, value=1.0)[0]['job_id']
+        second = self._submit_one(iface, value=2.0)[0]['job_id']
+        iface.get_many(iface.get_inputs())
         iface.get_many(iface.get_inputs())
-        assert iface._jobs[jid]['status'] == 'running'
 
-        # pipeline output arrives without metadata (transformers strip it)
-        iface.put_many({
-            'OUTPUT_X': {'value': 99.0},
-        })
-        assert iface._jobs[jid]['status'] == 'completed'
-        assert iface._jobs[jid]['outputs']['OUTPUT_X']['value'] == 99.0
-        iface.close()
+        iface.put_many({'OUTPUT_X': {'value': 10.0}})
+        assert iface._jobs[first]['status'] == 'completed'
+        assert iface._jobs[second]['status'] == 'running'
 
-    def test_completed_job_appears_in_completed_queue(self):
-        iface = SimpleFastAPIInterfaceServer(_make_config())
-        accepted = self._submit_one(iface)
-        jid = accepted[0]['job_id']
-        iface.get_many([], consume_jobs=True)
-        iface.put_many({
-            'OUTPUT_X': {
-                'value': 1.0,
-                'metadata': {'trace': {'job_id': jid}},
-            },
-        })
-        assert jid in iface._completed
-        iface.close()
+        iface.put_many({'OUTPUT_X': {'value': 20.0}})
+        assert iface._jobs[second]['status'] == 'completed'
+        assert iface._jobs[second]['outputs']['OUTPUT_X']['value'] == 20.0
 
-    def test_duplicate_job_id_raises(self):
-        from fastapi import HTTPException as FastHTTPException
+    def test_put_many_explicit_job_id_then_fifo(self, iface):
+        first = self._submit_one(iface, value=1.0)[0]['job_id']
+        second = self._submit_one(iface, value=2.0)[0]['job_id']
+        iface.get_many(iface.get_inputs())
+        iface.get_many(iface.get_inputs())
+
+        trace = {'trace': {'job_id': second}}
+        iface.put_many({'OUTPUT_X': {'value': 20.0, 'metadata': trace}})
+        assert iface._jobs[second]['status'] == 'completed'
+        assert list(iface._running) == [first]
 
-        iface = SimpleFastAPIInterfaceServer(_make_config())
+        iface.put_many({'OUTPUT_X': {'value': 10.0}})
+        assert iface._jobs[first]['status'] == 'completed'
+        assert not iface._running
+
+    def test_duplicate_job_id_raises(self, iface):
         self._submit_one(iface, job_id='dup-1')
         with pytest.raises(FastHTTPException) as exc_info:
             self._submit_one(iface, job_id='dup-1')
         assert exc_info.value.status_code == 409
-        iface.close()
 
-    def test_batch_multiple_jobs(self):
-        from poly_lithic.src.interfaces.fastapi_interface import (
-            JobInput,
-            VariableStruct,
-        )
-
-        iface = SimpleFastAPIInterfaceServer(_make_config())
-        jobs = [
-            JobInput(variables={'INPUT_A': VariableStruct(value=float(i))})
-            for i in range(5)
-        ]
+    @pytest.mark.parametrize('n', [5, 50, 500])
+    def test_batch_multiple_jobs(self, n, iface):
+        jobs = [_job(v) for v in np.arange(n, dtype=float)]
         accepted = iface._enqueue_jobs(jobs)
-        assert len(accepted) == 5
-        assert len(iface._queued) == 5
-        iface.close()
+        assert len(accepted) == n
+        assert len(iface._queued) == n
 
 
 # ---------------------------------------------------------------------------
@@ -416,59 +453,35 @@ class TestJobLifecycle:
 
 
 class TestQueueCapacity:
-    def test_input_queue_full(self):
-        from fastapi import HTTPException as FastHTTPException
-        from poly_lithic.src.interfaces.fastapi_interface import (
-            JobInput,
-            VariableStruct,
-        )
-
-        cfg = _make_config(input_queue_max=3)
-        iface = SimpleFastAPIInterfaceServer(cfg)
-
-        jobs = [
-            JobInput(variables={'INPUT_A': VariableStruct(value=float(i))})
-            for i in range(3)
-        ]
-        iface._enqueue_jobs(jobs)
+    @pytest.mark.parametrize('iface', [_make_config(input_queue_max=3)], indirect=True)
+    def test_input_queue_full(self, iface):
+        iface._enqueue_jobs([_job(float(i)) for i in range(3)])
 
         with pytest.raises(FastHTTPException) as exc_info:
-            iface._enqueue_jobs([
-                JobInput(variables={'INPUT_A': VariableStruct(value=99.0)})
-            ])
+            iface._enqueue_jobs([_job(99.0)])
         assert exc_info.value.status_code == 429
-        iface.close()
-
-    def test_output_queue_eviction(self):
-        from poly_lithic.src.interfaces.fastapi_interface import (
-            JobInput,
-            VariableStruct,
-        )
-
-        cfg = _make_config(output_queue_max=2)
-        iface = SimpleFastAPIInterfaceServer(cfg)
 
+    @pytest.mark.parametrize('iface', [_make_config(output_queue_max=2)], indirect=True)
+    def test_output_queue_eviction(self, iface):
         # Submit and complete 3 jobs
-        for i in range(3):
-            accepted = iface._enqueue_jobs([
-                JobInput(
-                    job_id=f'job-{i}',
-                    variables={'INPUT_A': VariableStruct(value=float(i))},
-                )
-            ])
-            iface.get_many([], consume_jobs=True)
-            iface.put_many({
+        outputs = [
+            {
                 'OUTPUT_X': {
                     'value': float(i),
                     'metadata': {'trace': {'job_id': f'job-{i}'}},
                 },
-            })
+            }
+            for i in range(3)
+        ]
+        for i, output in enumerate(outputs):
+            iface._enqueue_jobs([_job(float(i), f'job-{i}')])
+            iface.get_many([], consume_jobs=True)
+            iface.put_many(output)
 
         # 3 completed but max is 2, so job-0 should be evicted (failed)
         assert iface._jobs['job-0']['status'] == 'failed'
-        assert 'overflow' in iface._jobs['job-0']['error'].lower()
+        assert iface._jobs['job-0']['error_kind'] == 'OVERFLOW'
         assert len(iface._completed) == 2
-        iface.close()
 
 
 # ---------------------------------------------------------------------------
@@ -477,44 +490,24 @@ class TestQueueCapacity:
 
 
 class TestMonitor:
-    def test_register_callback(self):
-        iface = SimpleFastAPIInterfaceServer(_make_config())
+    def test_register_callback(self, iface):
         calls = []
         result = iface.monitor(lambda data: calls.append(data))
         assert result is True
-        iface.close()
-
-    def test_callback_fires_on_submit(self):
-        from poly_lithic.src.interfaces.fastapi_interface import (
-            JobInput,
-            VariableStruct,
-        )
 
-        iface = SimpleFastAPIInterfaceServer(_make_config())
+    def test_callback_fires_on_submit(self, iface):
         calls = []
         iface.monitor(lambda data: calls.append(data))
 
-        iface._enqueue_jobs([
-            JobInput(variables={'INPUT_A': VariableStruct(value=99.0)})
-        ])
+        iface._enqueue_jobs([_job(99.0)])
         assert len(calls) == 1
         assert 'INPUT_A' in calls[0]
-        iface.close()
 
-    def test_callback_exception_does_not_fail(self):
-        from poly_lithic.src.interfaces.fastapi_interface import (
-            JobInput,
-            VariableStruct,
-        )
-
-        iface = SimpleFastAPIInterfaceServer(_make_config())
+    def test_callback_exception_does_not_fail(self, iface):
         iface.monitor(lambda data: 1 / 0)  # will raise ZeroDivisionError
 
         # should not raise
-        iface._enqueue_jobs([
-            JobInput(variables={'INPUT_A': VariableStruct(value=1.0)})
-        ])
-        iface.close()
+        iface._enqueue_jobs([_job(1.0)])
 
 
 # ---------------------------------------------------------------------------
@@ -523,22 +516,24 @@ class TestMonitor:
 
 
 class TestServerLifecycle:
-    def test_no_server_when_disabled(self):
-        iface = SimpleFastAPIInterfaceServer(_make_config(start_server=False))
+    def test_no_server_when_disabled(self, iface):
         assert iface._server is None
         assert iface._server_thread is None
-        iface.close()
 
+    @pytest.mark.slow
     def test_server_starts_and_closes(self):
         cfg = _make_config(
             start_server=True,
             wait_for_server_start=True,
             startup_timeout_s=5.0,
-            port=18321,  # unlikely to collide
+            port=0,  # any free port
         )
         iface = SimpleFastAPIInterfaceServer(cfg)
         assert iface._server is not None
         assert iface._server.started
+        thread = iface._server_thread
+        assert thread.is_alive()
         iface.close()
         # thread should have joined
+        assert not thread.is_alive()
         assert iface._server_thread is None
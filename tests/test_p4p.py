@@ -3,45 +3,180 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 # from poly_lithic.src.interfaces import SimplePVAInterface
+import contextlib
+import fcntl
+import os
+import signal
 import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
 
 import numpy as np
 import pytest
-from poly_lithic.src.interfaces import registered_interfaces
-from poly_lithic.src.logging_utils.make_logger import make_logger
-import sys
+
+# poly_lithic.src.interfaces imports p4p unconditionally; skip cleanly without it
+pytest.importorskip('p4p')
+
+from p4p.client.thread import Context  # noqa: E402
+from poly_lithic.src.interfaces import registered_interfaces  # noqa: E402
+from poly_lithic.src.logging_utils.make_logger import make_logger  # noqa: E402
 
 SimplePVAInterface = registered_interfaces['p4p']
-# start mailbox.py as a subprocess
 
 logger = make_logger('model_manager')
 
-process = None
+# Seeded so failures in the random-data tests can be reproduced.
+_rng = np.random.default_rng(42)
+
+# One mailbox.py server is shared by the pytest(-xdist) workers of a run.
+# The first worker to arrive starts it, the last one to leave stops it. The
+# state files are keyed by the xdist run id (or by this process when not
+# under xdist), so a crashed or concurrent run's leftovers are never adopted.
+_MAILBOX_SCRIPT = Path(__file__).with_name('mailbox.py')
+_RUN_ID = os.environ.get('PYTEST_XDIST_TESTRUNUID') or f'{os.getuid()}-{os.getpid()}'
+_MAILBOX_STATE = Path(tempfile.gettempdir()) / f'pl_mailbox-{_RUN_ID}'
+_MAILBOX_LOCK = _MAILBOX_STATE.with_name(f'{_MAILBOX_STATE.name}.lock')
+_MAILBOX_PID = _MAILBOX_STATE.with_name(f'{_MAILBOX_STATE.name}.pid')
+_MAILBOX_REFS = _MAILBOX_STATE.with_name(f'{_MAILBOX_STATE.name}.refs')
+
+
+@contextmanager
+def _mailbox_lock():
+    while True:
+        lock = open(_MAILBOX_LOCK, 'a')
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            current = os.path.samestat(os.fstat(lock.fileno()), os.stat(_MAILBOX_LOCK))
+        except FileNotFoundError:
+            current = False
+        if current:
+            break
+        # the last worker out unlinked the lock while we waited on it
+        lock.close()
+    with lock:  # closing it releases the flock
+        yield
+
+
+def _read_int(path):
+    try:
+        return int(path.read_text())
+    except (FileNotFoundError, ValueError):
+        return 0
+
+
+def _is_mailbox(pid):
+    """True only if *pid* is a running mailbox.py, not a reused pid or a zombie."""
+    if pid <= 0:
+        return False
+    if os.path.isdir('/proc'):
+        try:
+            args = Path(f'/proc/{pid}/cmdline').read_bytes().split(b'\0')
+        except OSError:
+            return False
+        return os.fsencode(_MAILBOX_SCRIPT) in args
+    # no procfs (e.g. macOS)
+    result = subprocess.run(
+        ['ps', '-o', 'args=', '-p', str(pid)], capture_output=True, text=True
+    )
+    return str(_MAILBOX_SCRIPT) in result.stdout
+
+
+def _stop_mailbox(pid, timeout=2.0):
+    """SIGTERM the mailbox's process group, then SIGKILL whatever is left."""
+    try:
+        pgid = os.getpgid(pid)
+    except ProcessLookupError:
+        return
+    os.killpg(pgid, signal.SIGTERM)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with contextlib.suppress(ChildProcessError):
+            os.waitpid(pid, os.WNOHANG)  # reap it if this worker started it
+        if not _is_mailbox(pid):
+            return
+        time.sleep(0.05)
+    with contextlib.suppress(ProcessLookupError):
+        os.killpg(pgid, signal.SIGKILL)
+
+
+def _wait_for_mailbox(timeout=10.0):
+    """Block until the mailbox answers a PVA get, rather than sleeping."""
+    ctxt = Context('pva', nt=False)
+    deadline = time.monotonic() + timeout
+    try:
+        while True:
+            try:
+                ctxt.get('test:float:AA', timeout=0.5)
+                return
+            except TimeoutError:
+                if time.monotonic() > deadline:
+                    raise
+    finally:
+        ctxt.close()
 
 
 # run before tests
 @pytest.fixture(scope='session', autouse=True)
 def setup():
-    global process
-    # process = subprocess.Popen(["python", "mailbox.py"], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    process = subprocess.Popen(
-        [sys.executable, './tests/mailbox.py'],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-    )
+    with _mailbox_lock():
+        if not _is_mailbox(_read_int(_MAILBOX_PID)):
+            process = subprocess.Popen(
+                [sys.executable, str(_MAILBOX_SCRIPT)],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                close_fds=True,
+                start_new_session=True,
+            )
+            _MAILBOX_PID.write_text(str(process.pid))
+        # not reset on a restart: workers already counted still need it
+        _MAILBOX_REFS.write_text(str(_read_int(_MAILBOX_REFS) + 1))
+    _wait_for_mailbox()
     yield
-    process.kill()
+    with _mailbox_lock():
+        refs = _read_int(_MAILBOX_REFS) - 1
+        _MAILBOX_REFS.write_text(str(refs))
+        if refs <= 0:
+            pid = _read_int(_MAILBOX_PID)
+            if _is_mailbox(pid):
+                _stop_mailbox(pid)
+            _MAILBOX_PID.unlink(missing_ok=True)
+            _MAILBOX_REFS.unlink(missing_ok=True)
+            _MAILBOX_LOCK.unlink(missing_ok=True)
+
+
+# The plain put/get tests read different PVs, so they can share one client.
+_PLAIN_CONFIG = {
+    'variables': {
+        'test:float:AA': {'name': 'test:float:AA', 'proto': 'pva'},
+        'test:float:BB': {'name': 'test:float:BB', 'proto': 'pva'},
+        'test:image:AA': {
+            'name': 'test:image:AA',
+            'proto': 'pva',
+            'type': 'image',
+        },
+        'test:array:AA': {
+            'name': 'test:array:AA',
+            'proto': 'pva',
+            'type': 'array',
+        },
+    }
+}
 
 
-def test_SimplePVAInterface_init():
-    config = {
-        'variables': {
-            'test:float:AA': {'name': 'test:float:AA', 'proto': 'pva'},
-            'test:float:BB': {'name': 'test:float:BB', 'proto': 'pva'},
-        }
-    }
+@pytest.fixture(scope='module')
+def pva_iface():
+    """One SimplePVAInterface over the mailbox PVs, shared by the module."""
+    iface = SimplePVAInterface(_PLAIN_CONFIG)
+    yield iface
+    iface.close()
+
+
+def test_SimplePVAInterface_init(pva_iface):
     logger.info('Testing SimplePVAInterface init')
-    p4p = SimplePVAInterface(config)
+    p4p = pva_iface
     nameA, valA = p4p.get('test:float:AA')
     assert valA['value'] == 0
 
@@ -54,58 +189,35 @@ def test_SimplePVAInterface_init():
     assert valB['value'] == 2
     assert nameA == 'test:float:AA'
     assert nameB == 'test:float:BB'
-    p4p.close()
 
 
-def test_SimplePVAInterface_put_and_get_image():
-    config = {
-        'variables': {
-            'test:image:AA': {
-                'name': 'test:image:AA',
-                'proto': 'pva',
-                'type': 'image',
-            }
-        }
-    }
-    p4p = SimplePVAInterface(config)
+def test_SimplePVAInterface_put_and_get_image(pva_iface):
+    p4p = pva_iface
 
     name, image_get = p4p.get('test:image:AA')
     shape = image_get['value'].shape
     print(shape)
     assert image_get['value'][0][0] == 1  # should be intialized to 1 by mailbox.py
 
-    arry = np.random.rand(shape[0], shape[1])
+    arry = _rng.random(shape)
     p4p.put('test:image:AA', arry)
     name, image_get = p4p.get('test:image:AA')
     print(type(image_get['value']))
     assert image_get['value'][0][0] == arry[0][0]
 
-    p4p.close()
 
-
-def test_SimplePVAInterface_put_and_get_array():
-    config = {
-        'variables': {
-            'test:array:AA': {
-                'name': 'test:array:AA',
-                'proto': 'pva',
-                'type': 'array',
-            }
-        }
-    }
-    p4p = SimplePVAInterface(config)
+def test_SimplePVAInterface_put_and_get_array(pva_iface):
+    p4p = pva_iface
 
     name, array_get = p4p.get('test:array:AA')
     print(array_get['value'])
     assert type(array_get['value']) == np.ndarray
-    arry = np.random.rand(10)
-    p4p.put('test:array:AA', arry.tolist())
+    arry = _rng.random(10)
+    p4p.put('test:array:AA', arry)
     name, array_get = p4p.get('test:array:AA')
     print(array_get)
     np.testing.assert_array_equal(array_get['value'], arry)
 
-    p4p.close()
-
 
 def test_SimplePVAInterface_reject_compute_alarm_on_non_scalar():
     config = {
@@ -8,9 +8,13 @@ import socket
 
 import numpy as np
 import pytest
-from poly_lithic.src.interfaces import registered_interfaces
-from poly_lithic.src.logging_utils.make_logger import make_logger
-from poly_lithic.src.transformers import registered_transformers
+
+# poly_lithic.src.interfaces imports p4p unconditionally; skip cleanly without it
+pytest.importorskip('p4p')
+
+from poly_lithic.src.interfaces import registered_interfaces  # noqa: E402
+from poly_lithic.src.logging_utils.make_logger import make_logger  # noqa: E402
+from poly_lithic.src.transformers import registered_transformers  # noqa: E402
 
 SimplePVAInterfaceServer = registered_interfaces['p4p_server']
 SimplePVAInterface = registered_interfaces['p4p']
@@ -18,100 +22,130 @@ CompoundTransformer = registered_transformers['CompoundTransformer']
 
 logger = make_logger('model_manager')
 
-
-def _get_free_port():
+# Seeded so failures in the random-data tests can be reproduced.
+_rng = np.random.default_rng(42)
+
+# Read-only test data, built once.
+_ARRAY_10 = _rng.random(10)
+_IMG_10x10 = np.ones((10, 10))
+
+# valueAlarm templates; the interface copies these, so tests can share them.
+_ALARM_LIMITS = {
+    'lowAlarmLimit': -5.0,
+    'lowWarningLimit': -2.0,
+    'highWarningLimit': 2.0,
+    'highAlarmLimit': 5.0,
+}
+_VALUE_ALARM = {
+    'active': True,
+    **_ALARM_LIMITS,
+    'lowAlarmSeverity': 2,
+    'lowWarningSeverity': 1,
+    'highWarningSeverity': 1,
+    'highAlarmSeverity': 2,
+}
+_SCALAR_PV = {'name': 'test', 'proto': 'pva', 'type': 'scalar'}
+
+
+@pytest.fixture
+def free_port():
+    """A free TCP port, picked just before the test that binds it."""
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
         sock.bind(('127.0.0.1', 0))
         return sock.getsockname()[1]
 
 
-def test_SimplePVAInterfaceServer_init():
-    config = {'variables': {'test': {'name': 'test', 'proto': 'pva'}}}
-    logger.info('Testing SimplePVAInterfaceServer init')
-    p4p = SimplePVAInterfaceServer(config)
-    assert p4p.shared_pvs['test'].isOpen()
-    p4p.close()
-
-
-def test_SimplePVAInterfaceServer_put_and_get():
-    config = {'variables': {'test': {'name': 'test', 'proto': 'pva'}}}
-    logger.info('Testing SimplePVAInterfaceServer put')
-    p4p = SimplePVAInterfaceServer(config)
-    assert p4p.shared_pvs['test'].isOpen()
-    p4p.put('test', 1)
-    name, value_dict = p4p.get('test')
-    print(name, value_dict)
-    assert value_dict['value'] == 1
-    assert name == 'test'
-    p4p.close()
-
-
-def test_SimplePVAInterfaceServer_put_and_get_image():
+@pytest.fixture(scope='module')
+def pva_server():
+    """One server hosting a distinct PV for each test that only needs to put/get."""
     config = {
         'variables': {
-            'test': {
-                'name': 'test',
+            # 'test' is left for the client/server test's own server
+            'test_basic': {'name': 'test_basic', 'proto': 'pva'},
+            'test_scalar': {'name': 'test_scalar', 'proto': 'pva', 'type': 'scalar'},
+            'test_image': {
+                'name': 'test_image',
                 'proto': 'pva',
                 'type': 'image',
                 'image_size': {'x': 10, 'y': 10},
-            }
+            },
+            'test_waveform': {
+                'name': 'test_waveform',
+                'proto': 'pva',
+                'type': 'waveform',
+            },
+            'test_default': {'name': 'test_default', 'proto': 'pva', 'default': 5},
+            'test_default_array': {
+                'name': 'test_default_array',
+                'proto': 'pva',
+                'type': 'waveform',
+                'default': [1, 2, 3],
+            },
+            'test_array_alarm': {
+                'name': 'test_array_alarm',
+                'proto': 'pva',
+                'type': 'waveform',
+                'default': [0.0, 0.0, 0.0],
+            },
+            'test_array_value_alarm': {
+                'name': 'test_array_value_alarm',
+                'proto': 'pva',
+                'type': 'waveform',
+                'default': [0.0, 0.0, 0.0],
+                'valueAlarm': _VALUE_ALARM,
+            },
         }
     }
-    p4p = SimplePVAInterfaceServer(config)
+    server = SimplePVAInterfaceServer(config)
+    yield server
+    server.close()
+
+
+def test_SimplePVAInterfaceServer_init(pva_server):
+    logger.info('Testing SimplePVAInterfaceServer init')
+    assert pva_server.shared_pvs['test_basic'].isOpen()
+
+
+def test_SimplePVAInterfaceServer_put_and_get(pva_server):
+    logger.info('Testing SimplePVAInterfaceServer put')
+    assert pva_server.shared_pvs['test_basic'].isOpen()
+    pva_server.put('test_basic', 1)
+    name, value_dict = pva_server.get('test_basic')
+    logger.debug('%s %s', name, value_dict)
+    assert value_dict['value'] == 1
+    assert name == 'test_basic'
 
-    arry = np.ones((10, 10))
 
-    p4p.put('test', arry)
-    name, value_dict = p4p.get('test')
-    print(name, value_dict)
-    print(value_dict['value'], type(value_dict['value']))
+def test_SimplePVAInterfaceServer_put_and_get_image(pva_server):
+    arry = _IMG_10x10
+
+    pva_server.put('test_image', arry)
+    name, value_dict = pva_server.get('test_image')
+    logger.debug('%s %s', name, value_dict)
+    logger.debug('%s %s', value_dict['value'], type(value_dict['value']))
     assert value_dict['value'][0][0] == arry[0][0]
     assert value_dict['value'].shape == arry.shape
-    assert name == 'test'
-    p4p.close()
-
+    assert name == 'test_image'
 
-def test_SimplePVAInterface_put_and_get_array():
-    config = {
-        'variables': {
-            'test:array_l:AA': {
-                'name': 'test:array_l:AA',
-                'proto': 'pva',
-                'type': 'waveform',
-            }
-        }
-    }
-    p4p = SimplePVAInterfaceServer(config)
 
-    arry = np.random.rand(10)
-    p4p.put('test:array_l:AA', arry.tolist())
+def test_SimplePVAInterface_put_and_get_array(pva_server):
+    arry = _ARRAY_10
+    pva_server.put('test_waveform', arry)
 
-    name, array_get = p4p.get('test:array_l:AA')
-    print(array_get['value'])
+    name, array_get = pva_server.get('test_waveform')
+    logger.debug('%s', array_get['value'])
     assert type(array_get['value']) == np.ndarray
 
-    name, array_get = p4p.get('test:array_l:AA')
-    print(array_get)
+    name, array_get = pva_server.get('test_waveform')
+    logger.debug('%s', array_get)
     np.testing.assert_array_equal(array_get['value'], arry)
 
-    p4p.close()
-
 
 # more of an integration test than a unit test
-def test_p4p_as_image_input():
-    config = {
-        'variables': {
-            'test': {
-                'name': 'test',
-                'proto': 'pva',
-                'type': 'image',
-                'image_size': {'x': 10, 'y': 10},
-            }
-        }
-    }
+def test_p4p_as_image_input(pva_server):
     config_pt = {
         'variables': {
-            'IMG1': 'test',
+            'IMG1': 'test_image',
         }
     }
     config_compound = {
@@ -119,16 +153,13 @@ def test_p4p_as_image_input():
             'transformer_1': {'type': 'PassThroughTransformer', 'config': config_pt},
         }
     }
-
-    p4p = SimplePVAInterfaceServer(config)
     pt = CompoundTransformer(config_compound)
 
-    p4p.put('test', np.ones((10, 10)))
-    name, value_dict = p4p.get('test')
-    pt.handler('test', value_dict)
+    pva_server.put('test_image', _IMG_10x10)
+    name, value_dict = pva_server.get('test_image')
+    pt.handler('test_image', value_dict)
     assert pt.updated is True
     assert pt.latest_transformed['IMG1'].shape == (10, 10)
-    p4p.close()
 
 
 def test_SimplePVAInterfaceServer_put_and_get_unknown_type():
@@ -147,158 +178,99 @@ def test_SimplePVAInterfaceServer_put_and_get_unknown_type():
         p4p_server.close()
 
 
-def test_SimplePVAInterfaceServer_put_and_get_scalar():
-    config = {
-        'variables': {
-            'test': {
-                'name': 'test',
-                'proto': 'pva',
-                'type': 'scalar',
-            }
-        }
-    }
-    p4p = SimplePVAInterfaceServer(config)
-
-    assert p4p.shared_pvs['test'].isOpen()
+def test_SimplePVAInterfaceServer_put_and_get_scalar(pva_server):
+    assert pva_server.shared_pvs['test_scalar'].isOpen()
 
     val = 5
-    p4p.put('test', val)
-    name, value_dict = p4p.get('test')
-    print(name, value_dict)
-    print(value_dict['value'], type(value_dict['value']))
+    pva_server.put('test_scalar', val)
+    name, value_dict = pva_server.get('test_scalar')
+    logger.debug('%s %s', name, value_dict)
+    logger.debug('%s %s', value_dict['value'], type(value_dict['value']))
     assert value_dict['value'] == val
-    assert name == 'test'
-    p4p.close()
-
+    assert name == 'test_scalar'
 
-def test_initialise_with_defaults():
-    config = {
-        'variables': {
-            'test': {
-                'name': 'test',
-                'proto': 'pva',
-                'default': 5,
-            },
-            'test_array': {
-                'name': 'test_array',
-                'proto': 'pva',
-                'type': 'waveform',
-                'default': [1, 2, 3],
-            },
-        }
-    }
 
-    p4p = SimplePVAInterfaceServer(config)
-    assert p4p.shared_pvs['test'].isOpen()
-    assert p4p.shared_pvs['test_array'].isOpen()
+def test_initialise_with_defaults(pva_server):
+    shared_pvs = pva_server.shared_pvs
+    assert shared_pvs['test_default'].isOpen()
+    assert shared_pvs['test_default_array'].isOpen()
 
-    assert p4p.shared_pvs['test'].current().raw.value == 5
-    assert p4p.shared_pvs['test_array'].current().raw.value[0] == 1
-    assert p4p.shared_pvs['test_array'].current().raw.value[1] == 2
-    assert p4p.shared_pvs['test_array'].current().raw.value[2] == 3
-    assert isinstance(p4p.shared_pvs['test_array'].current().raw.value, np.ndarray)
-    p4p.close()
+    assert shared_pvs['test_default'].current().raw.value == 5
+    val = shared_pvs['test_default_array'].current().raw.value
+    assert isinstance(val, np.ndarray)
+    np.testing.assert_array_equal(val, np.array([1, 2, 3]))
 
 
-def test_scalar_compute_alarm_on_server():
+@pytest.fixture(scope='module')
+def alarm_server():
+    """Scalar PVs with computed alarms: explicit and default severities."""
     config = {
         'variables': {
-            'test': {
-                'name': 'test',
+            'test_alarm': {
+                'name': 'test_alarm',
                 'proto': 'pva',
                 'type': 'scalar',
                 'compute_alarm': True,
-                'valueAlarm': {
-                    'active': True,
-                    'lowAlarmLimit': -5.0,
-                    'lowWarningLimit': -2.0,
-                    'highWarningLimit': 2.0,
-                    'highAlarmLimit': 5.0,
-                    'lowAlarmSeverity': 2,
-                    'lowWarningSeverity': 1,
-                    'highWarningSeverity': 1,
-                    'highAlarmSeverity': 2,
-                },
-            }
-        }
-    }
-    p4p = SimplePVAInterfaceServer(config)
-
-    p4p.put('test', 6.0)
-    alarm = p4p.shared_pvs['test'].current().raw.alarm
-    assert alarm.severity == 2
-    assert alarm.status == 3
-    assert alarm.message == 'HIHI'
-
-    p4p.put('test', -3.0)
-    alarm = p4p.shared_pvs['test'].current().raw.alarm
-    assert alarm.severity == 1
-    assert alarm.status == 6
-    assert alarm.message == 'LOW'
-
-    p4p.put('test', 0.0)
-    alarm = p4p.shared_pvs['test'].current().raw.alarm
-    assert alarm.severity == 0
-    assert alarm.status == 0
-    assert alarm.message == ''
-    p4p.close()
-
-
-def test_non_scalar_manual_alarm_passthrough_on_server():
-    config = {
-        'variables': {
-            'test_array': {
-                'name': 'test_array',
+                'valueAlarm': _VALUE_ALARM,
+            },
+            'test_default_severities': {
+                'name': 'test_default_severities',
                 'proto': 'pva',
-                'type': 'waveform',
-                'default': [0.0, 0.0, 0.0],
-            }
+                'type': 'scalar',
+                'compute_alarm': True,
+                'valueAlarm': _ALARM_LIMITS,
+            },
         }
     }
-    p4p = SimplePVAInterfaceServer(config)
+    server = SimplePVAInterfaceServer(config)
+    yield server
+    server.close()
+
+
+@pytest.mark.parametrize(
+    'pv, val, sev, status, msg',
+    [
+        pytest.param('test_alarm', 6.0, 2, 3, 'HIHI', id='alarm-HIHI'),
+        pytest.param('test_alarm', 3.0, 1, 4, 'HIGH', id='alarm-HIGH'),
+        pytest.param('test_alarm', -3.0, 1, 6, 'LOW', id='alarm-LOW'),
+        pytest.param('test_alarm', 0.0, 0, 0, '', id='alarm-NO_ALARM'),
+        # missing severities default to MINOR(1) for HIGH and MAJOR(2) for HIHI
+        pytest.param(
+            'test_default_severities', 3.0, 1, 4, 'HIGH', id='default_severities-HIGH'
+        ),
+        pytest.param(
+            'test_default_severities', 6.0, 2, 3, 'HIHI', id='default_severities-HIHI'
+        ),
+    ],
+)
+def test_scalar_compute_alarm_on_server(alarm_server, pv, val, sev, status, msg):
+    alarm_server.put(pv, val)
+    alarm = alarm_server.shared_pvs[pv].current().raw.alarm
+    assert alarm.severity == sev
+    assert alarm.status == status
+    assert alarm.message == msg
+
+
+def test_non_scalar_manual_alarm_passthrough_on_server(pva_server):
     payload = {
         'value': [1.0, 2.0, 3.0],
         'alarm': {'severity': 1, 'status': 4, 'message': 'HIGH'},
     }
-    p4p.put('test_array', payload)
+    pva_server.put('test_array_alarm', payload)
 
-    current = p4p.shared_pvs['test_array'].current().raw
+    current = pva_server.shared_pvs['test_array_alarm'].current().raw
     np.testing.assert_array_equal(current.value, np.array([1.0, 2.0, 3.0]))
     assert current.alarm.severity == 1
     assert current.alarm.status == 4
     assert current.alarm.message == 'HIGH'
-    p4p.close()
 
 
-def test_non_scalar_without_explicit_alarm_does_not_compute():
-    config = {
-        'variables': {
-            'test_array': {
-                'name': 'test_array',
-                'proto': 'pva',
-                'type': 'waveform',
-                'default': [0.0, 0.0, 0.0],
-                'valueAlarm': {
-                    'active': True,
-                    'lowAlarmLimit': -5.0,
-                    'lowWarningLimit': -2.0,
-                    'highWarningLimit': 2.0,
-                    'highAlarmLimit': 5.0,
-                    'lowAlarmSeverity': 2,
-                    'lowWarningSeverity': 1,
-                    'highWarningSeverity': 1,
-                    'highAlarmSeverity': 2,
-                },
-            }
-        }
-    }
-    p4p = SimplePVAInterfaceServer(config)
-    p4p.put('test_array', [10.0, 11.0, 12.0])
-    alarm = p4p.shared_pvs['test_array'].current().raw.alarm
+def test_non_scalar_without_explicit_alarm_does_not_compute(pva_server):
+    pva_server.put('test_array_value_alarm', [10.0, 11.0, 12.0])
+    alarm = pva_server.shared_pvs['test_array_value_alarm'].current().raw.alarm
     assert alarm.severity == 0
     assert alarm.status == 0
     assert alarm.message == ''
-    p4p.close()
 
 
 def test_reject_compute_alarm_on_non_scalar_server():
@@ -309,17 +281,7 @@ def test_reject_compute_alarm_on_non_scalar_server():
                 'proto': 'pva',
                 'type': 'waveform',
                 'compute_alarm': True,
-                'valueAlarm': {
-                    'active': True,
-                    'lowAlarmLimit': -5.0,
-                    'lowWarningLimit': -2.0,
-                    'highWarningLimit': 2.0,
-                    'highAlarmLimit': 5.0,
-                    'lowAlarmSeverity': 2,
-                    'lowWarningSeverity': 1,
-                    'highWarningSeverity': 1,
-                    'highAlarmSeverity': 2,
-                },
+                'valueAlarm': _VALUE_ALARM,
             }
         }
     }
@@ -327,38 +289,13 @@ def test_reject_compute_alarm_on_non_scalar_server():
         SimplePVAInterfaceServer(config)
 
 
-def test_client_scalar_compute_alarm_to_server(monkeypatch):
-    port = _get_free_port()
-    server_config = {
-        'port': port,
-        'variables': {
-            'test': {
-                'name': 'test',
-                'proto': 'pva',
-                'type': 'scalar',
-            }
-        },
-    }
+def test_client_scalar_compute_alarm_to_server(monkeypatch, free_port):
+    port = free_port
+    server_config = {'port': port, 'variables': {'test': _SCALAR_PV}}
     client_config = {
         'EPICS_PVA_NAME_SERVERS': f'127.0.0.1:{port}',
         'variables': {
-            'test': {
-                'name': 'test',
-                'proto': 'pva',
-                'type': 'scalar',
-                'compute_alarm': True,
-                'valueAlarm': {
-                    'active': True,
-                    'lowAlarmLimit': -5.0,
-                    'lowWarningLimit': -2.0,
-                    'highWarningLimit': 2.0,
-                    'highAlarmLimit': 5.0,
-                    'lowAlarmSeverity': 2,
-                    'lowWarningSeverity': 1,
-                    'highWarningSeverity': 1,
-                    'highAlarmSeverity': 2,
-                },
-            }
+            'test': {**_SCALAR_PV, 'compute_alarm': True, 'valueAlarm': _VALUE_ALARM}
         },
     }
 
@@ -377,42 +314,6 @@ def test_client_scalar_compute_alarm_to_server(monkeypatch):
         server.close()
 
 
-def test_scalar_compute_alarm_defaults_missing_severities():
-    config = {
-        'variables': {
-            'test': {
-                'name': 'test',
-                'proto': 'pva',
-                'type': 'scalar',
-                'compute_alarm': True,
-                'valueAlarm': {
-                    'lowAlarmLimit': -5.0,
-                    'lowWarningLimit': -2.0,
-                    'highWarningLimit': 2.0,
-                    'highAlarmLimit': 5.0,
-                },
-            }
-        }
-    }
-    p4p = SimplePVAInterfaceServer(config)
-    try:
-        # HIGH band defaults to MINOR(1)
-        p4p.put('test', 3.0)
-        alarm = p4p.shared_pvs['test'].current().raw.alarm
-        assert alarm.severity == 1
-        assert alarm.status == 4
-        assert alarm.message == 'HIGH'
-
-        # HIHI band defaults to MAJOR(2)
-        p4p.put('test', 6.0)
-        alarm = p4p.shared_pvs['test'].current().raw.alarm
-        assert alarm.severity == 2
-        assert alarm.status == 3
-        assert alarm.message == 'HIHI'
-    finally:
-        p4p.close()
-
-
 def test_reject_server_compute_alarm_with_active_false():
     config = {
         'variables': {
@@ -421,13 +322,7 @@ def test_reject_server_compute_alarm_with_active_false():
                 'proto': 'pva',
                 'type': 'scalar',
                 'compute_alarm': True,
-                'valueAlarm': {
-                    'active': False,
-                    'lowAlarmLimit': -5.0,
-                    'lowWarningLimit': -2.0,
-                    'highWarningLimit': 2.0,
-                    'highAlarmLimit': 5.0,
-                },
+                'valueAlarm': {'active': False, **_ALARM_LIMITS},
             }
         }
     }
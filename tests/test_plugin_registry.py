@@ -7,8 +7,74 @@ Unit tests for plugin_registry module.
 """
 
 import pytest
+from importlib.metadata import EntryPoint, EntryPoints
 from unittest.mock import Mock, patch, MagicMock
-from poly_lithic.src.utils.plugin_registry import PluginRegistry
+from poly_lithic.src.utils.plugin_registry import (
+    PluginRegistry,
+    _entry_point_index,
+    interface_plugin_registry,
+    model_getter_plugin_registry,
+    transformer_plugin_registry,
+)
+
+# Placeholder plugin/entry point for tests that only check containment.
+_SENTINEL = object()
+
+_GLOBAL_REGISTRIES = (
+    interface_plugin_registry,
+    transformer_plugin_registry,
+    model_getter_plugin_registry,
+)
+
+
+@pytest.fixture(scope='session')
+def _mock_eps_data():
+    """Mock entry points, built once; tests only read their names."""
+    mock_ep = Mock()
+    mock_ep.name = 'discovered_plugin'
+    return [mock_ep]
+
+
+@pytest.fixture
+def mock_entry_points(_mock_eps_data):
+    """Patch the shared entry point index to serve the prebuilt mocks."""
+    index = {'test.group': {ep.name: ep for ep in _mock_eps_data}}
+    with patch(
+        'poly_lithic.src.utils.plugin_registry._entry_point_index',
+        return_value=index,
+    ) as mock_index:
+        yield mock_index
+
+
+@pytest.fixture
+def clean_registries():
+    """Reset the global registries before and after the test."""
+    for registry in _GLOBAL_REGISTRIES:
+        registry.clear()
+    yield _GLOBAL_REGISTRIES
+    for registry in _GLOBAL_REGISTRIES:
+        registry.clear()
+
+
+@pytest.fixture(scope='class')
+def discovered_registries(_mock_eps_data):
+    """Discover the global registries once against mocked entry points.
+
+    Class-scoped rather than session-scoped: the registries are module globals,
+    so they are cleared again before tests elsewhere see them.
+    """
+    index = {'poly_lithic.interfaces': {ep.name: ep for ep in _mock_eps_data}}
+    for registry in _GLOBAL_REGISTRIES:
+        registry.clear()
+    with patch(
+        'poly_lithic.src.utils.plugin_registry._entry_point_index',
+        return_value=index,
+    ):
+        for registry in _GLOBAL_REGISTRIES:
+            registry.discover_plugins()
+    yield _GLOBAL_REGISTRIES
+    for registry in _GLOBAL_REGISTRIES:
+        registry.clear()
 
 
 class TestPluginRegistryHasPlugin:
@@ -21,7 +87,7 @@ class TestPluginRegistryHasPlugin:
 
     def test_has_plugin_not_discovered_triggers_discovery(self, registry):
         """Test that has_plugin triggers discovery if not yet discovered."""
-        with patch.object(registry, 'discover_plugins') as mock_discover:
+        with patch.object(PluginRegistry, 'discover_plugins') as mock_discover:
             registry.has_plugin('test_plugin')
             mock_discover.assert_called_once()
 
@@ -29,118 +95,135 @@ class TestPluginRegistryHasPlugin:
         """Test that has_plugin doesn't trigger discovery if already discovered."""
         registry._discovered = True
 
-        with patch.object(registry, 'discover_plugins') as mock_discover:
+        with patch.object(PluginRegistry, 'discover_plugins') as mock_discover:
             registry.has_plugin('test_plugin')
             mock_discover.assert_not_called()
 
-    def test_has_plugin_in_plugins_dict(self, registry):
-        """Test has_plugin returns True when plugin is in _plugins dict."""
+    @pytest.mark.parametrize(
+        'plugins, entry_points, name, expected',
+        [
+            pytest.param(['test_plugin'], [], 'test_plugin', True, id='in_plugins'),
+            pytest.param(
+                [], ['test_plugin'], 'test_plugin', True, id='in_entry_points'
+            ),
+            pytest.param(
+                ['test_plugin'], ['test_plugin'], 'test_plugin', True, id='in_both'
+            ),
+            pytest.param([], [], 'nonexistent_plugin', False, id='not_found'),
+            pytest.param([], [], '', False, id='empty_string'),
+            pytest.param(['TestPlugin'], [], 'TestPlugin', True, id='case_exact'),
+            pytest.param(['TestPlugin'], [], 'testplugin', False, id='case_lower'),
+            pytest.param(['TestPlugin'], [], 'TESTPLUGIN', False, id='case_upper'),
+            pytest.param(
+                ['test-plugin_v2.0'],
+                [],
+                'test-plugin_v2.0',
+                True,
+                id='special_characters',
+            ),
+            pytest.param(
+                ['plugin1', 'plugin2'], ['plugin3'], 'plugin2', True, id='many_plugins'
+            ),
+            pytest.param(
+                ['plugin1', 'plugin2'],
+                ['plugin3'],
+                'plugin3',
+                True,
+                id='many_entry_points',
+            ),
+            pytest.param(
+                ['plugin1', 'plugin2'], ['plugin3'], 'plugin4', False, id='many_missing'
+            ),
+        ],
+    )
+    def test_has_plugin(self, registry, plugins, entry_points, name, expected):
+        """Test has_plugin against plugins and entry points already in place."""
         registry._discovered = True
+        registry._plugins.update(dict.fromkeys(plugins, _SENTINEL))
+        registry._entry_points.update(dict.fromkeys(entry_points, _SENTINEL))
 
-        mock_class = Mock()
-        registry._plugins['test_plugin'] = mock_class
-
-        assert registry.has_plugin('test_plugin') is True
-
-    def test_has_plugin_in_entry_points(self, registry):
-        """Test has_plugin returns True when plugin is in _entry_points."""
-        registry._discovered = True
-
-        mock_entry_point = Mock()
-        registry._entry_points['test_plugin'] = mock_entry_point
-
-        assert registry.has_plugin('test_plugin') is True
-
-    def test_has_plugin_in_both_locations(self, registry):
-        """Test has_plugin returns True when plugin is in both _plugins and _entry_points."""
-        registry._discovered = True
-
-        mock_class = Mock()
-        mock_entry_point = Mock()
-        registry._plugins['test_plugin'] = mock_class
-        registry._entry_points['test_plugin'] = mock_entry_point
-
-        assert registry.has_plugin('test_plugin') is True
-
-    def test_has_plugin_not_found(self, registry):
-        """Test has_plugin returns False when plugin is not found."""
-        registry._discovered = True
-
-        assert registry.has_plugin('nonexistent_plugin') is False
-
-    def test_has_plugin_empty_registry(self, registry):
-        """Test has_plugin returns False when registry is empty."""
-        registry._discovered = True
-
-        assert registry.has_plugin('any_plugin') is False
-
-    def test_has_plugin_case_sensitive(self, registry):
-        """Test has_plugin is case-sensitive."""
-        registry._discovered = True
+        assert registry.has_plugin(name) is expected
 
-        mock_class = Mock()
-        registry._plugins['TestPlugin'] = mock_class
+    def test_has_plugin_with_real_discovery(self, mock_entry_points):
+        """Test has_plugin with actual discovery process."""
+        registry = PluginRegistry('test.group')
 
-        assert registry.has_plugin('TestPlugin') is True
-        assert registry.has_plugin('testplugin') is False
-        assert registry.has_plugin('TESTPLUGIN') is False
+        assert registry.has_plugin('discovered_plugin') is True
+        assert registry._discovered is True
+        mock_entry_points.assert_called_once_with()
 
-    def test_has_plugin_with_special_characters(self, registry):
-        """Test has_plugin works with plugin names containing special characters."""
-        registry._discovered = True
+    def test_discover_plugins_idempotent(self, mock_entry_points):
+        """Test that repeated discovery is a no-op until clear() re-arms it."""
+        registry = PluginRegistry('test.group')
 
-        mock_class = Mock()
-        registry._plugins['test-plugin_v2.0'] = mock_class
+        registry.discover_plugins()
+        registry.discover_plugins()
+        mock_entry_points.assert_called_once_with()
 
-        assert registry.has_plugin('test-plugin_v2.0') is True
+        registry.clear()
+        registry.discover_plugins()
+        assert mock_entry_points.call_count == 2
+        assert registry.has_plugin('discovered_plugin') is True
 
-    def test_has_plugin_empty_string(self, registry):
-        """Test has_plugin with empty string."""
-        registry._discovered = True
+    @patch('poly_lithic.src.utils.plugin_registry.entry_points')
+    def test_entry_points_scanned_once_across_registries(self, mock_entry_points):
+        """Test that several registries share a single entry point scan."""
+        mock_entry_points.return_value = EntryPoints([
+            EntryPoint('plugin_a', 'pkg_a:PluginA', 'group.a'),
+            EntryPoint('plugin_b', 'pkg_b:PluginB', 'group.b'),
+        ])
+        _entry_point_index.cache_clear()
+        try:
+            registry_a = PluginRegistry('group.a')
+            registry_b = PluginRegistry('group.b')
+            assert registry_a.list_plugins() == ['plugin_a']
+            assert registry_b.list_plugins() == ['plugin_b']
+            mock_entry_points.assert_called_once_with()
+        finally:
+            _entry_point_index.cache_clear()
 
-        assert registry.has_plugin('') is False
+    @patch('poly_lithic.src.utils.plugin_registry.entry_points')
+    def test_duplicate_entry_point_last_wins(self, mock_entry_points):
+        """Test that a later entry point with the same name replaces an earlier one."""
+        second = EntryPoint('dup_plugin', 'pkg_b:Plugin', 'test.group')
+        mock_entry_points.return_value = EntryPoints([
+            EntryPoint('dup_plugin', 'pkg_a:Plugin', 'test.group'),
+            second,
+        ])
+        _entry_point_index.cache_clear()
+        try:
+            registry = PluginRegistry('test.group')
+            registry.discover_plugins()
+            assert registry._entry_points == {'dup_plugin': second}
+        finally:
+            _entry_point_index.cache_clear()
 
-    def test_has_plugin_multiple_plugins(self, registry):
-        """Test has_plugin with multiple plugins in registry."""
+    def test_has_plugin_after_register(self, registry):
+        """Test has_plugin returns True after registering a plugin."""
         registry._discovered = True
 
-        registry._plugins['plugin1'] = Mock()
-        registry._plugins['plugin2'] = Mock()
-        registry._entry_points['plugin3'] = Mock()
+        registry.register('new_plugin', _SENTINEL)
 
-        assert registry.has_plugin('plugin1') is True
-        assert registry.has_plugin('plugin2') is True
-        assert registry.has_plugin('plugin3') is True
-        assert registry.has_plugin('plugin4') is False
-
-    @patch('poly_lithic.src.utils.plugin_registry.entry_points')
-    def test_has_plugin_with_real_discovery(self, mock_entry_points):
-        """Test has_plugin with actual discovery process."""
-        mock_ep = Mock()
-        mock_ep.name = 'discovered_plugin'
-        mock_entry_points.return_value = [mock_ep]
-
-        registry = PluginRegistry('test.group')
-
-        assert registry.has_plugin('discovered_plugin') is True
-        assert registry._discovered is True
-        mock_entry_points.assert_called_once_with(group='test.group')
+        assert registry.has_plugin('new_plugin') is True
 
-    def test_has_plugin_after_register(self, registry):
-        """Test has_plugin returns True after registering a plugin."""
+    def test_register_overrides_discovered_entry_point(self, registry):
+        """Test that register replaces an entry point with the same name."""
         registry._discovered = True
+        mock_entry_point = Mock()
+        registry._entry_points['test_plugin'] = mock_entry_point
 
         mock_class = Mock()
-        registry.register('new_plugin', mock_class)
+        registry.register('test_plugin', mock_class)
 
-        assert registry.has_plugin('new_plugin') is True
+        assert 'test_plugin' not in registry._entry_points
+        assert registry.get('test_plugin') is mock_class
+        mock_entry_point.load.assert_not_called()
 
     def test_has_plugin_after_unregister(self, registry):
         """Test has_plugin returns False after unregistering a plugin."""
         registry._discovered = True
 
-        mock_class = Mock()
-        registry._plugins['temp_plugin'] = mock_class
+        registry._plugins['temp_plugin'] = _SENTINEL
 
         assert registry.has_plugin('temp_plugin') is True
 
@@ -152,9 +235,55 @@ class TestPluginRegistryHasPlugin:
         """Test has_plugin can be called multiple times with same result."""
         registry._discovered = True
 
-        mock_class = Mock()
-        registry._plugins['test_plugin'] = mock_class
+        registry._plugins['test_plugin'] = _SENTINEL
 
         assert registry.has_plugin('test_plugin') is True
         assert registry.has_plugin('test_plugin') is True
         assert registry.has_plugin('test_plugin') is True
+
+    def test_has_plugin_false_after_failed_load(self, registry):
+        """Test that an entry point which fails to load is dropped."""
+        registry._discovered = True
+
+        mock_entry_point = Mock()
+        mock_entry_point.load.side_effect = ImportError('broken plugin')
+        registry._entry_points['broken_plugin'] = mock_entry_point
+
+        with pytest.raises(ImportError):
+            registry.get('broken_plugin')
+
+        assert registry.has_plugin('broken_plugin') is False
+
+
+class TestGlobalRegistries:
+    """Test suite for the module-level registries."""
+
+    @pytest.mark.parametrize(
+        'registry, expected',
+        [
+            (interface_plugin_registry, True),
+            (transformer_plugin_registry, False),
+            (model_getter_plugin_registry, False),
+        ],
+        ids=['interfaces', 'transformers', 'model_getters'],
+    )
+    def test_global_registries_discover_their_own_group(
+        self, discovered_registries, registry, expected
+    ):
+        """Test that each global registry only picks up its own group."""
+        assert registry._discovered is True
+        assert registry.has_plugin('discovered_plugin') is expected
+
+
+class TestGlobalRegistration:
+    """Tests that mutate the module-level registries.
+
+    Kept out of TestGlobalRegistries: clean_registries clears the registries
+    that class's discovered_registries fixture set up once for all its tests.
+    """
+
+    def test_register_on_global_registry(self, clean_registries):
+        """Test that a manual registration on a global registry is visible."""
+        interface_plugin_registry.register('manual_interface', _SENTINEL)
+
+        assert interface_plugin_registry.get('manual_interface') is _SENTINEL